@@ -59,19 +59,22 @@ def symexp(x):
 
 
 def two_hot(x, cfg):
-    """Converts a batch of scalars to soft two-hot encoded targets for discrete regression."""
+    """
+    Converts a batch of scalars to soft two-hot encoded targets for discrete regression.
+    Accepts any number of leading batch dimensions; input shape (..., 1) maps to (..., num_bins).
+    """
     if cfg.num_bins == 0:
         return x
     elif cfg.num_bins == 1:
         return symlog(x)
-    x = torch.clamp(symlog(x), cfg.vmin, cfg.vmax).squeeze(1)
+    x = torch.clamp(symlog(x), cfg.vmin, cfg.vmax).squeeze(-1)
     bin_idx = torch.floor((x - cfg.vmin) / cfg.bin_size)
     bin_offset = ((x - cfg.vmin) / cfg.bin_size - bin_idx).unsqueeze(-1)
-    soft_two_hot = torch.zeros(x.shape[0], cfg.num_bins, device=x.device, dtype=x.dtype)
+    soft_two_hot = torch.zeros(*x.shape, cfg.num_bins, device=x.device, dtype=x.dtype)
     bin_idx = bin_idx.long()
-    soft_two_hot = soft_two_hot.scatter(1, bin_idx.unsqueeze(1), 1 - bin_offset)
+    soft_two_hot = soft_two_hot.scatter(-1, bin_idx.unsqueeze(-1), 1 - bin_offset)
     soft_two_hot = soft_two_hot.scatter(
-        1, (bin_idx.unsqueeze(1) + 1) % cfg.num_bins, bin_offset
+        -1, (bin_idx.unsqueeze(-1) + 1) % cfg.num_bins, bin_offset
     )
     return soft_two_hot
 
@@ -90,14 +93,13 @@ def two_hot_inv(x, cfg):
     return symexp(x)
 
 
-def gumbel_softmax_sample(p, temperature=1.0, dim=0):
+def gumbel_softmax_sample(p, temperature=1.0, dim=0, noise=None):
     logits = p.log()
-    # Generate Gumbel noise
-    gumbels = (
-        -torch.empty_like(logits, memory_format=torch.legacy_contiguous_format)
-        .exponential_()
-        .log()
-    )  # ~Gumbel(0,1)
+    # Generate Gumbel noise, optionally into a caller-provided buffer so the
+    # sample reuses a persistent allocation under CUDA graphs
+    if noise is None:
+        noise = torch.empty_like(logits, memory_format=torch.legacy_contiguous_format)
+    gumbels = -noise.exponential_().log()  # ~Gumbel(0,1)
     gumbels = (logits + gumbels) / temperature  # ~Gumbel(logits,tau)
     y_soft = gumbels.softmax(dim)
     return y_soft.argmax(-1)
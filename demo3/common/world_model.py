@@ -76,6 +76,14 @@ class WorldModel(nn.Module):
         self._detach_Qs.params = self._detach_Qs_params
         self._target_Qs.params = self._target_Qs_params
 
+        # Cache flat leaf lists for the single-kernel target soft-update
+        self._detach_Qs_leaves = list(
+            self._detach_Qs_params.values(include_nested=True, leaves_only=True)
+        )
+        self._target_Qs_leaves = list(
+            self._target_Qs_params.values(include_nested=True, leaves_only=True)
+        )
+
     def __repr__(self):
         repr = "TD-MPC2 World Model\n"
         modules = ["Encoder", "Dynamics", "Reward", "Policy prior", "Q-functions"]
@@ -106,11 +114,26 @@ class WorldModel(nn.Module):
         self._target_Qs.train(False)
         return self
 
+    def set_training_mode(self, mode=True):
+        """
+        Lightweight train/eval switch. Only the Q-ensemble and its detached
+        copy behave differently between modes (dropout), so flipping those two
+        subtrees avoids walking the full module tree on every update step.
+        Target Q-networks always stay in eval mode.
+        """
+        self._Qs.train(mode)
+        self._detach_Qs.train(mode)
+        return self
+
     def soft_update_target_Q(self):
         """
         Soft-update target Q-networks using Polyak averaging.
+        Uses a single foreach kernel over the cached parameter leaves instead
+        of one lerp_ per leaf; addresses are static, so it is cudagraph-safe.
         """
-        self._target_Qs_params.lerp_(self._detach_Qs_params, self.cfg.tau)
+        torch._foreach_lerp_(
+            self._target_Qs_leaves, self._detach_Qs_leaves, self.cfg.tau
+        )
 
     def task_emb(self, x, task):
         """
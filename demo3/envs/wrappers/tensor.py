@@ -46,6 +46,10 @@ class TensorWrapper(gym.Wrapper):
         return self.env.render(*args, **kwargs)
 
     def step(self, action):
+        if isinstance(action, torch.Tensor) and action.is_pinned():
+            # Actions are staged into pinned memory with an async copy
+            # (see TDMPC2._stage_action); wait for it before consuming.
+            torch.cuda.current_stream().synchronize()
         obs, reward, _, done, info = self.env.step(action)
         obs = self._obs_to_tensor(obs)
         if isinstance(info, tuple):
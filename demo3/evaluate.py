@@ -212,7 +212,9 @@ def evaluate(cfg: dict):
                         terminated = done  # Only terminate when truncated
                         info = {k: v.cpu() for k, v in info.items()}
                         saver.add_transition(
-                            action.cpu(),
+                            # Copy: `act` returns a view of a reusable staging
+                            # buffer, and .cpu() aliases it when already on CPU
+                            action.cpu().clone(),
                             obs_save.cpu(),
                             reward.cpu(),
                             terminated.cpu(),
@@ -54,10 +54,12 @@ class Buffer:
         """
         Reserve a buffer with the given storage.
         """
+        # Pin sampled batches when storage lives in CPU memory so that
+        # `_prepare_batch` can overlap its H2D copies (non_blocking=True).
         return ReplayBuffer(
             storage=storage,
             sampler=self._sampler,
-            pin_memory=False,
+            pin_memory=self._storage_device.type == "cpu",
             prefetch=0,
             batch_size=self._batch_size,
         )
@@ -14,12 +14,28 @@ class TDMPC2(torch.nn.Module):
     and supports both state and pixel observations.
     """
 
+    METRIC_KEYS = (
+        "consistency_loss",
+        "reward_loss",
+        "value_loss",
+        "pi_loss",
+        "total_loss",
+        "grad_norm",
+        "pi_grad_norm",
+        "pi_scale",
+    )
+
     def __init__(self, cfg):
         super().__init__()
         self.cfg = cfg
         self.device = torch.device("cuda:0")
         self.model = WorldModel(cfg).to(self.device)
         self.bc_model = WorldModel(cfg).to(self.device)
+        # Fused Adam updates all parameters in a single kernel; capturable
+        # state is only needed (and only worth its overhead) under CUDA graphs.
+        adam_kwargs = dict(fused=True)
+        if cfg.compile:
+            adam_kwargs["capturable"] = True
         self.optim = torch.optim.Adam(
             [
                 {
@@ -36,12 +52,14 @@ class TDMPC2(torch.nn.Module):
                 },
             ],
             lr=self.cfg.lr,
-            capturable=True,
+            **adam_kwargs,
         )
         self.pi_optim = torch.optim.Adam(
-            self.model._pi.parameters(), lr=self.cfg.lr, eps=1e-5, capturable=True
+            self.model._pi.parameters(), lr=self.cfg.lr, eps=1e-5, **adam_kwargs
+        )
+        self.bc_optim = torch.optim.Adam(
+            self.bc_model.parameters(), lr=self.cfg.lr, **adam_kwargs
         )
-        self.bc_optim = torch.optim.Adam(self.bc_model.parameters(), lr=self.cfg.lr)
         self.model.eval()
         self.scale = RunningScale(cfg)
         self.cfg.iterations += 2 * int(
@@ -53,7 +71,27 @@ class TDMPC2(torch.nn.Module):
                 device="cuda:0",
             )
             if self.cfg.multitask
-            else self._get_discount(cfg.episode_length)
+            else torch.tensor(self._get_discount(cfg.episode_length), device="cuda:0")
+        )
+        self._act_cpu = torch.empty(
+            self.cfg.num_envs, self.cfg.action_dim, pin_memory=True
+        )
+        self._task_pinned = torch.empty(1, dtype=torch.long, pin_memory=True)
+        self._task_gpu = torch.empty(1, dtype=torch.long, device=self.device)
+        self._rho_powers = torch.pow(
+            cfg.rho, torch.arange(cfg.horizon + 1, device=self.device)
+        )
+        _discount = self.discount if self.cfg.multitask else self.discount.unsqueeze(0)
+        self._discount_powers = torch.nn.Buffer(
+            torch.cat(
+                [
+                    torch.ones_like(_discount).unsqueeze(-1),
+                    torch.cumprod(
+                        _discount.unsqueeze(-1).expand(-1, self.cfg.horizon), dim=-1
+                    ),
+                ],
+                dim=-1,
+            )
         )
         self._prev_mean = torch.nn.Buffer(
             torch.zeros(
@@ -63,6 +101,48 @@ class TDMPC2(torch.nn.Module):
                 device=self.device,
             )
         )
+        # Persistent planning tensors: static addresses allow CUDA-graph
+        # reuse when `_plan` is compiled with mode="reduce-overhead".
+        self._plan_actions = torch.nn.Buffer(
+            torch.empty(
+                self.cfg.num_envs,
+                self.cfg.horizon,
+                self.cfg.num_samples,
+                self.cfg.action_dim,
+                device=self.device,
+            )
+        )
+        self._plan_r = torch.nn.Buffer(
+            torch.empty(
+                self.cfg.num_envs,
+                self.cfg.horizon,
+                self.cfg.num_samples - self.cfg.num_pi_trajs,
+                self.cfg.action_dim,
+                device=self.device,
+            )
+        )
+        self._plan_mean = torch.nn.Buffer(
+            torch.empty(
+                self.cfg.num_envs,
+                self.cfg.horizon,
+                self.cfg.action_dim,
+                device=self.device,
+            )
+        )
+        self._plan_std = torch.nn.Buffer(
+            torch.empty(
+                self.cfg.num_envs,
+                self.cfg.horizon,
+                self.cfg.action_dim,
+                device=self.device,
+            )
+        )
+        self._gumbel_noise = torch.nn.Buffer(
+            torch.empty(self.cfg.num_envs, self.cfg.num_elites, device=self.device)
+        )
+        self._act_noise = torch.nn.Buffer(
+            torch.empty(self.cfg.action_dim, device=self.device)
+        )
         if cfg.compile:
             print("compiling - tdmpc update")
             self._update = torch.compile(self._update, mode="reduce-overhead")
@@ -74,7 +154,7 @@ class TDMPC2(torch.nn.Module):
         _plan_val = getattr(self, "_plan_val", None)
         if _plan_val is not None:
             return _plan_val
-        if False:  # self.cfg.compile:
+        if self.cfg.compile:
             plan = torch.compile(self._plan, mode="reduce-overhead")
         else:
             plan = self._plan
@@ -119,6 +199,28 @@ class TDMPC2(torch.nn.Module):
         state_dict = fp if isinstance(fp, dict) else torch.load(fp)
         self.model.load_state_dict(state_dict["model"])
 
+    def _stage_task(self, task):
+        """
+        Move a task index to the device through a pinned staging buffer,
+        avoiding the blocking host allocation of `torch.tensor(task, device=...)`.
+        """
+        if isinstance(task, torch.Tensor):
+            return task.to(self.device, non_blocking=True)
+        self._task_pinned[0] = task
+        self._task_gpu.copy_(self._task_pinned, non_blocking=True)
+        return self._task_gpu
+
+    def _stage_action(self, a):
+        """
+        Stage a device action into pinned host memory with an async copy.
+        The returned tensor aliases a reusable staging buffer: consumers must
+        synchronize with the copy stream before reading, and copy the data if
+        they keep it beyond the next `act`/`policy_action` call.
+        """
+        a_cpu = self._act_cpu[: a.shape[0]] if a.ndim > 1 else self._act_cpu[0]
+        a_cpu.copy_(a, non_blocking=True)
+        return a_cpu
+
     def init_bc(self, buffer):
         """
         Initialize policy using a behavior cloning objective.
@@ -147,6 +249,7 @@ class TDMPC2(torch.nn.Module):
         return metrics
 
     @torch.no_grad()
+    @torch.autocast(device_type="cuda", dtype=torch.bfloat16)
     def policy_action(self, obs, eval_mode=False, task=None):
         """
         Select an action by only sampling from policy.
@@ -162,12 +265,13 @@ class TDMPC2(torch.nn.Module):
         """
         obs = obs.to(self.device, non_blocking=True)
         if task is not None:
-            task = torch.tensor([task], device=self.device)
+            task = self._stage_task(task)
         z = self.bc_model.encode(obs, task)
         a = self.bc_model.pi(z, task)[int(not eval_mode)]
-        return a.cpu()
+        return self._stage_action(a)
 
     @torch.no_grad()
+    @torch.autocast(device_type="cuda", dtype=torch.bfloat16)
     def act(self, obs, t0=False, eval_mode=False, task=None):
         """
         Select an action by planning in the latent space of the world model.
@@ -183,38 +287,73 @@ class TDMPC2(torch.nn.Module):
         """
         obs = obs.to(self.device, non_blocking=True)
         if task is not None:
-            task = torch.tensor([task], device=self.device)
+            task = self._stage_task(task)
         if self.cfg.mpc:
             a = self.plan(obs, t0=t0, eval_mode=eval_mode, task=task)
         else:
             z = self.model.encode(obs, task)
             a = self.model.pi(z, task)[int(not eval_mode)][0]
-        return a.cpu()
+        return self._stage_action(a)
 
     @torch.no_grad()
+    @torch.autocast(device_type="cuda", dtype=torch.bfloat16)
     def _estimate_value(self, z, actions, task):
-        """Estimate value of a trajectory starting at latent state z and executing given actions."""
-        G, discount = 0, 1
+        """
+        Estimate value of a trajectory starting at latent state z and executing given actions.
+        `task` must already be an on-device index tensor (see `act`); it indexes
+        the precomputed discount powers once per call rather than once per step.
+        """
+        rewards = torch.empty(
+            actions.shape[0],
+            self.cfg.horizon,
+            actions.shape[2],
+            1,
+            device=actions.device,
+        )
         for t in range(self.cfg.horizon):
-            reward = math.two_hot_inv(
+            rewards[:, t] = math.two_hot_inv(
                 self.model.reward(z, actions[:, t], task), self.cfg
             )
             z = self.model.next(z, actions[:, t], task)
-            G = G + discount * reward
-            discount_update = (
-                self.discount[torch.tensor(task)]
-                if self.cfg.multitask
-                else self.discount
-            )
-            discount = discount * discount_update
-        return G + discount * self.model.Q(
-            z, self.model.pi(z, task)[1], task, return_type="avg"
+        discount_powers = (
+            self._discount_powers[task] if self.cfg.multitask else self._discount_powers
         )
+        G = (rewards * discount_powers[:, : self.cfg.horizon, None, None]).sum(1)
+        # nan_to_num lives here so Inductor can fuse it with the final add
+        return (
+            G
+            + discount_powers[:, -1, None, None]
+            * self.model.Q(z, self.model.pi(z, task)[1], task, return_type="avg")
+        ).nan_to_num(0)
+
+    def _pi_next(self, z, task):
+        """
+        Sample a policy-prior action and predict the following latent state.
+        Combining both calls lets Inductor fuse the policy and dynamics heads
+        into one graph per horizon step of the pi rollout in `_plan`.
+        """
+        a = self.model.pi(z, task)[1]
+        return a, self.model.next(z, a, task)
+
+    def _gather_actions(self, actions, idxs):
+        """
+        Gather action sequences along the sample dimension.
+        `actions` has shape (b_size, horizon, num_samples, action_dim) and
+        `idxs` has shape (b_size, k); returns shape (b_size, horizon, k, action_dim).
+        """
+        idxs = idxs.unsqueeze(1).unsqueeze(3).expand(
+            -1, self.cfg.horizon, -1, self.cfg.action_dim
+        )
+        return torch.gather(actions, 2, idxs)
 
     @torch.no_grad()
+    @torch.autocast(device_type="cuda", dtype=torch.bfloat16)
     def _plan(self, obs, t0=False, eval_mode=False, task=None):
         """
         Plan a sequence of actions using the learned world model.
+        Runs in BF16: planning is inference-only and dominated by GEMMs, so
+        autocast halves the bytes moved through the world-model layers while
+        the persistent mean/std/action buffers stay FP32.
 
         Args:
                 z (torch.Tensor): Latent state from which to plan. Shape (b_size, z_dim)
@@ -225,109 +364,78 @@ class TDMPC2(torch.nn.Module):
         Returns:
                 torch.Tensor: Action to take in the environment.
         """
-        # Sample policy trajectories
+        # Pad the latent batch to a fixed num_envs so the compiled plan
+        # captures a single CUDA graph regardless of the incoming batch size
         b_size = obs.shape[0]
         z = self.model.encode(obs, task)
+        if b_size != self.cfg.num_envs:
+            z = torch.cat([z, z[-1:].expand(self.cfg.num_envs - b_size, -1)], dim=0)
+
+        # Sample policy trajectories directly into the actions buffer
+        action_mask = self.model._action_masks[task] if self.cfg.multitask else None
+        actions = self._plan_actions
         if self.cfg.num_pi_trajs > 0:
-            pi_actions = torch.empty(
-                b_size,
-                self.cfg.horizon,
-                self.cfg.num_pi_trajs,
-                self.cfg.action_dim,
-                device=self.device,
-            )
+            pi_actions = actions[:, :, : self.cfg.num_pi_trajs]
             _z = z.unsqueeze(1).repeat(1, self.cfg.num_pi_trajs, 1)
             for t in range(self.cfg.horizon - 1):
-                pi_actions[:, t] = self.model.pi(_z, task)[1]
-                _z = self.model.next(_z, pi_actions[:, t], task)
+                pi_actions[:, t], _z = self._pi_next(_z, task)
             pi_actions[:, -1] = self.model.pi(_z, task)[1]
 
         # Initialize state and parameters
         z = z.unsqueeze(1).repeat(1, self.cfg.num_samples, 1)
-        mean = torch.zeros(
-            b_size, self.cfg.horizon, self.cfg.action_dim, device=self.device
-        )
-        std = torch.full(
-            (b_size, self.cfg.horizon, self.cfg.action_dim),
-            self.cfg.max_std,
-            dtype=torch.float,
-            device=self.device,
-        )
+        mean = self._plan_mean
+        mean.zero_()
+        std = self._plan_std
+        std.fill_(self.cfg.max_std)
         if not t0:
             mean[:, :-1] = self._prev_mean[:, 1:]
-        actions = torch.empty(
-            b_size,
-            self.cfg.horizon,
-            self.cfg.num_samples,
-            self.cfg.action_dim,
-            device=self.device,
-        )
-        if self.cfg.num_pi_trajs > 0:
-            actions[:, :, : self.cfg.num_pi_trajs] = pi_actions
 
         # Iterate MPPI
         for _ in range(self.cfg.iterations):
 
             # Sample actions
-            r = torch.randn(
-                b_size,
-                self.cfg.horizon,
-                self.cfg.num_samples - self.cfg.num_pi_trajs,
-                self.cfg.action_dim,
-                device=std.device,
-            )
-            actions_sample = mean.unsqueeze(2) + std.unsqueeze(2) * r
-            actions_sample = actions_sample.clamp(-1, 1)
-            actions[:, :, self.cfg.num_pi_trajs :] = actions_sample
+            r = self._plan_r
+            r.normal_()
+            actions_sample = actions[:, :, self.cfg.num_pi_trajs :]
+            torch.addcmul(mean.unsqueeze(2), std.unsqueeze(2), r, out=actions_sample)
+            actions_sample.clamp_(-1, 1)
             if self.cfg.multitask:
-                actions = actions * self.model._action_masks[task]
+                actions.mul_(action_mask)
 
             # Compute elite actions
-            value = self._estimate_value(z, actions, task).nan_to_num(0)
+            value = self._estimate_value(z, actions, task)
             elite_idxs = torch.topk(
                 value.squeeze(2), self.cfg.num_elites, dim=1
             ).indices
             elite_value = torch.gather(value, 1, elite_idxs.unsqueeze(2))
-            elite_actions = torch.gather(
-                actions,
-                2,
-                elite_idxs.unsqueeze(1)
-                .unsqueeze(3)
-                .expand(-1, self.cfg.horizon, -1, self.cfg.action_dim),
-            )
+            elite_actions = self._gather_actions(actions, elite_idxs)
 
             # Update parameters
-            max_value = elite_value.max(1).values
-            score = torch.exp(
-                self.cfg.temperature * (elite_value - max_value.unsqueeze(1))
-            )
-            score = score / score.sum(1, keepdim=True)
-            mean = (score.unsqueeze(1) * elite_actions).sum(dim=2) / (
-                score.sum(1, keepdim=True) + 1e-9
+            max_value = elite_value.max(1, keepdim=True).values
+            score = torch.exp(self.cfg.temperature * (elite_value - max_value))
+            score = score / score.sum(1, keepdim=True).clamp_min(1e-9)
+            weights = score.unsqueeze(1)
+            mean.copy_((weights * elite_actions).sum(dim=2))
+            std.copy_(
+                (weights * (elite_actions - mean.unsqueeze(2)) ** 2)
+                .sum(dim=2)
+                .sqrt()
+                .clamp(self.cfg.min_std, self.cfg.max_std)
             )
-            std = (
-                (score.unsqueeze(1) * (elite_actions - mean.unsqueeze(2)) ** 2).sum(
-                    dim=2
-                )
-                / (score.sum(1, keepdim=True) + 1e-9)
-            ).sqrt()
-            std = std.clamp(self.cfg.min_std, self.cfg.max_std)
             if self.cfg.multitask:
-                mean = mean * self.model._action_masks[task]
-                std = std * self.model._action_masks[task]
+                mean.mul_(action_mask)
+                std.mul_(action_mask)
 
         # Select action sequence with probability `score`
         rand_idx = math.gumbel_softmax_sample(
-            score.squeeze(-1), dim=1
+            score.squeeze(-1), dim=1, noise=self._gumbel_noise
         )  # gumbel_softmax_sample is compatible with cuda graphs
-        actions = torch.stack(
-            [elite_actions[i, :, rand_idx[i]] for i in range(rand_idx.shape[0])], dim=0
-        )
+        actions = self._gather_actions(elite_actions, rand_idx.unsqueeze(1)).squeeze(2)
         a, std = actions[:, 0], std[:, 0]
         if not eval_mode:
-            a = a + std * torch.randn(self.cfg.action_dim, device=std.device)
+            a = a + std * self._act_noise.normal_()
         self._prev_mean.copy_(mean)
-        return a.clamp(-1, 1)
+        return a.clamp(-1, 1)[:b_size]
 
     def update_pi(self, zs, task):
         """
@@ -346,7 +454,7 @@ class TDMPC2(torch.nn.Module):
         qs = self.scale(qs)
 
         # Loss is a weighted sum of Q-values
-        rho = torch.pow(self.cfg.rho, torch.arange(len(qs), device=self.device))
+        rho = self._rho_powers[: len(qs)]
         pi_loss = ((self.cfg.entropy_coef * log_pis - qs).mean(dim=(1, 2)) * rho).mean()
         pi_loss.backward()
         pi_grad_norm = torch.nn.utils.clip_grad_norm_(
@@ -398,9 +506,6 @@ class TDMPC2(torch.nn.Module):
             # Compute td_targets
             td_targets = self._td_target(next_z, reward, task)
 
-        # Prepare for update
-        self.model.train()
-
         # Latent rollout
         zs = torch.empty(
             self.cfg.horizon + 1,
@@ -410,12 +515,8 @@ class TDMPC2(torch.nn.Module):
         )
         z = self.model.encode(obs[0], task)
         zs[0] = z
-        consistency_loss = 0
-        for t, (_action, _next_z) in enumerate(zip(action.unbind(0), next_z.unbind(0))):
+        for t, _action in enumerate(action.unbind(0)):
             z = self.model.next(z, _action, task)
-            consistency_loss = (
-                consistency_loss + F.mse_loss(z, _next_z) * self.cfg.rho**t
-            )
             zs[t + 1] = z
 
         # Predictions
@@ -424,26 +525,15 @@ class TDMPC2(torch.nn.Module):
         reward_preds = self.model.reward(_zs, action, task)
 
         # Compute losses
-        reward_loss, value_loss = 0, 0
-        for t, (rew_pred_unbind, rew_unbind, td_targets_unbind, qs_unbind) in enumerate(
-            zip(
-                reward_preds.unbind(0),
-                reward.unbind(0),
-                td_targets.unbind(0),
-                qs.unbind(1),
-            )
-        ):
-            reward_loss = (
-                reward_loss
-                + math.soft_ce(rew_pred_unbind, rew_unbind, self.cfg).mean()
-                * self.cfg.rho**t
-            )
-            for _, qs_unbind_unbind in enumerate(qs_unbind.unbind(0)):
-                value_loss = (
-                    value_loss
-                    + math.soft_ce(qs_unbind_unbind, td_targets_unbind, self.cfg).mean()
-                    * self.cfg.rho**t
-                )
+        rho_powers = self._rho_powers[: self.cfg.horizon]
+        consistency_losses = (zs[1:] - next_z).pow(2).mean(dim=(1, 2))
+        consistency_loss = (consistency_losses * rho_powers).sum()
+        reward_losses = math.soft_ce(reward_preds, reward, self.cfg).mean(dim=(1, 2))
+        reward_loss = (reward_losses * rho_powers).sum()
+        value_losses = math.soft_ce(qs, td_targets.unsqueeze(0), self.cfg).mean(
+            dim=(2, 3)
+        )
+        value_loss = (value_losses * rho_powers).sum()
 
         consistency_loss = consistency_loss / self.cfg.horizon
         reward_loss = reward_loss / self.cfg.horizon
@@ -468,23 +558,19 @@ class TDMPC2(torch.nn.Module):
         # Update target Q-functions
         self.model.soft_update_target_Q()
 
-        # Return training statistics
-        self.model.eval()
-        return (
-            TensorDict(
-                {
-                    "consistency_loss": consistency_loss,
-                    "reward_loss": reward_loss,
-                    "value_loss": value_loss,
-                    "pi_loss": pi_loss,
-                    "total_loss": total_loss,
-                    "grad_norm": grad_norm,
-                    "pi_grad_norm": pi_grad_norm,
-                    "pi_scale": self.scale.value,
-                }
-            )
-            .detach()
-            .mean()
+        # Return training statistics as a single stacked GPU tensor
+        # (decoded with METRIC_KEYS in `update`) to avoid per-metric syncs.
+        return torch.stack(
+            [
+                consistency_loss.detach(),
+                reward_loss.detach(),
+                value_loss.detach(),
+                pi_loss,
+                total_loss.detach(),
+                grad_norm,
+                pi_grad_norm,
+                self.scale.value[0],
+            ]
         )
 
     def update(self, buffer, **kwargs):
@@ -495,10 +581,15 @@ class TDMPC2(torch.nn.Module):
                 buffer (common.buffer.Buffer): Replay buffer.
 
         Returns:
-                dict: Dictionary of training statistics.
+                dict: Dictionary of training statistics. Values are 0-dim GPU
+                        tensors; they only sync with the host once the logger
+                        formats them, so callers should not call `.item()` per step.
         """
         obs, action, reward, task = buffer.sample()
         if task is not None:
             kwargs["task"] = task
+        self.model.set_training_mode(True)
         torch.compiler.cudagraph_mark_step_begin()
-        return self._update(obs, action, reward, **kwargs)
+        metrics = self._update(obs, action, reward, **kwargs)
+        self.model.set_training_mode(False)
+        return dict(zip(self.METRIC_KEYS, metrics.unbind(0)))
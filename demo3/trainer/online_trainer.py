@@ -78,7 +78,8 @@ class OnlineTrainer(Trainer):
         td = TensorDict(
             dict(
                 obs=obs,
-                action=action.unsqueeze(0),
+                # Copy: `act` returns a view of a reusable staging buffer
+                action=action.clone().unsqueeze(0),
                 reward=reward.unsqueeze(0),
             ),
             batch_size=(